@@ -0,0 +1,39 @@
+# ============================================================
+# One-time helper: dump the major-cities table to cities.parquet
+# so the visualization scripts load it as a typed columnar file
+# instead of rebuilding it from Python lists on every run.
+# ============================================================
+
+import pandas as pd
+
+cities_data = {
+    'City': ['Tokyo', 'Delhi', 'Shanghai', 'São Paulo', 'Mumbai', 'Beijing',
+             'Cairo', 'Dhaka', 'Mexico City', 'Osaka', 'Karachi', 'Chongqing',
+             'Istanbul', 'Buenos Aires', 'Kolkata', 'Lagos', 'Manila', 'Rio de Janeiro',
+             'Guangzhou', 'Los Angeles', 'Moscow', 'Paris', 'Bangkok', 'Jakarta',
+             'London', 'Lima', 'Seoul', 'Bogotá', 'Chennai', 'Bangalore'],
+    'Latitude': [35.6762, 28.7041, 31.2304, -23.5505, 19.0760, 39.9042,
+                 30.0444, 23.8103, 19.4326, 34.6937, 24.8607, 29.4316,
+                 41.0082, -34.6037, 22.5726, 6.5244, 14.5995, -22.9068,
+                 23.1291, 34.0522, 55.7558, 48.8566, 13.7563, -6.2088,
+                 51.5074, -12.0464, 37.5665, 4.7110, 13.0827, 12.9716],
+    'Longitude': [139.6503, 77.1025, 121.4737, -46.6333, 72.8777, 116.4074,
+                  31.2357, 90.4125, -99.1332, 135.5023, 67.0011, 106.9123,
+                  28.9784, -58.3816, 88.3639, 3.3792, 120.9842, -43.1729,
+                  113.2644, -118.2437, 37.6173, 2.3522, 100.5018, 106.8456,
+                  -0.1278, -77.0428, 126.9780, -74.0721, 80.2707, 77.5946],
+    'Population_Millions': [37.4, 32.9, 28.5, 22.6, 20.7, 20.5,
+                           21.3, 22.0, 21.9, 19.1, 16.8, 16.4,
+                           15.6, 15.4, 15.1, 14.9, 14.4, 13.7,
+                           13.6, 13.2, 12.6, 11.2, 10.9, 10.8,
+                           9.5, 11.2, 9.9, 11.3, 11.5, 12.8],
+    'Country': ['Japan', 'India', 'China', 'Brazil', 'India', 'China',
+                'Egypt', 'Bangladesh', 'Mexico', 'Japan', 'Pakistan', 'China',
+                'Turkey', 'Argentina', 'India', 'Nigeria', 'Philippines', 'Brazil',
+                'China', 'USA', 'Russia', 'France', 'Thailand', 'Indonesia',
+                'UK', 'Peru', 'South Korea', 'Colombia', 'India', 'India']
+}
+
+if __name__ == "__main__":
+    pd.DataFrame(cities_data).to_parquet("cities.parquet", index=False)
+    print("Wrote cities.parquet")